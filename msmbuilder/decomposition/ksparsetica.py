@@ -1,6 +1,7 @@
 from __future__ import print_function, division, absolute_import
 from six import PY2
 import numpy as np
+import scipy.linalg
 from msmbuilder.decomposition.tica import tICA
 from msmbuilder.decomposition._speigh import scdeflate
 
@@ -163,7 +164,8 @@ class KSparseTICA(tICA):
 
         # initialize
         A, B = self.offset_correlation_, self.covariance_
-        BinvA = np.linalg.inv(B).dot(A)
+        # B is a covariance matrix, so solve with its Cholesky factorization
+        BinvA = scipy.linalg.cho_solve(scipy.linalg.cho_factor(B), A)
         eig_vecs = []
 
         # recover components
@@ -175,7 +177,9 @@ class KSparseTICA(tICA):
 
         # compute pseudoeigenvalues
         vs = eig_vecs.T
-        eig_vals = np.diag((vs.T.dot(A).dot(vs)).dot(np.linalg.inv(vs.T.dot(B).dot(vs))))
+        # both projections are symmetric, so diag(vAv vBv^-1) == diag(vBv^-1 vAv)
+        eig_vals = np.diag(scipy.linalg.cho_solve(
+            scipy.linalg.cho_factor(vs.T.dot(B).dot(vs)), vs.T.dot(A).dot(vs)))
 
         # sort
         argsorted = np.argsort(eig_vals)[::-1]
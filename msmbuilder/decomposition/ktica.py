@@ -10,6 +10,7 @@
 from __future__ import print_function, division, absolute_import
 
 import numpy as np
+import scipy.linalg
 
 from .tica import tICA
 from .kernel_approximation import LandmarkNystroem
@@ -180,7 +181,10 @@ class KernelTICA(tICA):
         denominator = V.T.dot(m2.covariance_).dot(V)
 
         try:
-            trace = np.trace(numerator.dot(np.linalg.inv(denominator)))
+            # the denominator is a covariance matrix, so use its Cholesky
+            # factorization; trace(N D^-1) == trace(D^-1 N)
+            trace = np.trace(scipy.linalg.cho_solve(
+                scipy.linalg.cho_factor(denominator), numerator))
         except np.linalg.LinAlgError:
             trace = np.nan
         return trace
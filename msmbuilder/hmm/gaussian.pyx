@@ -8,11 +8,14 @@ import time
 import warnings
 from sklearn import cluster, mixture
 from sklearn.utils import check_random_state
-from mdtraj.utils import ensure_type
+from sklearn.externals.joblib import Parallel, delayed
 from .discrete_approx import discrete_approx_mvn, NotSatisfiableError
 from ..utils import check_iter_of_sequences, printoptions
 from ..msm._markovstatemodel import _transmat_mle_prinz
 
+# Used to pad the M-step denominators away from zero.
+EPS = np.finfo(np.float32).eps
+
 
 cdef extern from "Trajectory.h" namespace "msmbuilder":
     cdef cppclass Trajectory:
@@ -87,6 +90,9 @@ cdef public class GaussianHMM[object GaussianHMMObject, type GaussianHMMType]:
     init_algo : str
         Use this algorithm to hotstart the means and covariances.  Must
         be one of "kmeans" or "GMM"
+    n_jobs : int, default=1
+        Number of the n_init runs of the EM algorithm to perform in
+        parallel, using joblib. If -1, all of the CPUs are used.
 
     References
     ----------
@@ -105,7 +111,7 @@ cdef public class GaussianHMM[object GaussianHMMObject, type GaussianHMMType]:
 
     cdef int n_states, n_features, n_init, n_iter
     cdef float thresh
-    cdef random_state, timing, n_hotstart
+    cdef random_state, timing, n_hotstart, n_jobs
     cdef startprob
     cdef stats
     cdef reversible_type, n_lqa_iter, fusion_prior, vars_prior, vars_weight, init_algo
@@ -115,7 +121,8 @@ cdef public class GaussianHMM[object GaussianHMMObject, type GaussianHMMType]:
                  n_lqa_iter=10, fusion_prior=1e-2, thresh=1e-2,
                  reversible_type='mle', vars_prior=1e-3,
                  vars_weight=1, random_state=None,
-                 timing=False, n_hotstart='all', init_algo='kmeans'):
+                 timing=False, n_hotstart='all', init_algo='kmeans',
+                 n_jobs=1):
         self.n_states = int(n_states)
         self.n_features = -1
         self.n_init = int(n_init)
@@ -130,6 +137,7 @@ cdef public class GaussianHMM[object GaussianHMMObject, type GaussianHMMType]:
         self.timing = timing
         self.n_hotstart = n_hotstart
         self.init_algo = init_algo
+        self.n_jobs = int(n_jobs)
         self.startprob = np.tile(1.0/n_states, n_states)
         self.stats = {}
 
@@ -146,10 +154,10 @@ cdef public class GaussianHMM[object GaussianHMMObject, type GaussianHMMType]:
         ['self', 'n_states', 'n_init', 'n_iter', 'n_lqa_iter',
          'fusion_prior', 'thresh', 'reversible_type', 'vars_prior',
          'vars_weight', 'random_state', 'timing',
-         'n_hotstart', 'init_algo'],
+         'n_hotstart', 'init_algo', 'n_jobs'],
           None, None,
           [10, 10, 10, 1e-2, 1e-2, 'mle', 1e-3, 1, None, False,
-          'all', 'kmeans']
+          'all', 'kmeans', 1]
         )
 
     @property
@@ -418,35 +426,30 @@ timescales: {timescales}
         self._validate_sequences(sequences)
         self.n_features = sequences[0].shape[1]
         dtype = sequences[0].dtype
-        best_fit = {'params': {}, 'loglikelihood': -np.inf}
+        if dtype not in (np.float32, np.float64):
+            raise ValueError('Unsupported data type: '+str(dtype))
         start_time = time.time()
         self.stats = {}
-        total_iters = 0
-        for run in range(self.n_init):
-            self._init(sequences)
-            if dtype == np.float32:
-                self._fit_float(sequences)
-            elif dtype == np.float64:
-                self._fit_double(sequences)
-            else:
-                raise ValueError('Unsupported data type: '+str(dtype))
-            total_iters += len(self.stats['log_probability'])
-
-            # If this is better than our other runs, keep it
-            if self.stats['log_probability'][-1] > best_fit['loglikelihood']:
-                best_fit['loglikelihood'] = self.stats['log_probability'][-1]
-                best_fit['params'] = {'means': self.means_,
-                                      'vars': self.vars_,
-                                      'populations': self.populations_,
-                                      'transmat': self.transmat_,
-                                      'fit_logprob': self.stats['log_probability']}
+        small_dataset = self._hotstart_dataset(sequences)
+
+        # Each run gets its own seed, so that the runs are independent
+        # (and reproducible) no matter which process performs them.
+        random_state = check_random_state(self.random_state)
+        seeds = random_state.randint(np.iinfo(np.int32).max, size=self.n_init)
+        runs = Parallel(n_jobs=self.n_jobs)(
+            delayed(_fit_one_run)(self, sequences, small_dataset, seed)
+            for seed in seeds)
+        total_iters = sum(len(run['fit_logprob']) for run in runs)
+
+        # Keep the run with the best log likelihood
+        best_fit = max(runs, key=lambda run: run['fit_logprob'][-1])
 
         # Set the final values
-        self._means_ = best_fit['params']['means']
-        self._vars_ = best_fit['params']['vars']
-        self._transmat_ = best_fit['params']['transmat']
-        self._populations_ = best_fit['params']['populations']
-        self._fit_logprob_ = best_fit['params']['fit_logprob']
+        self._means_ = best_fit['means']
+        self._vars_ = best_fit['vars']
+        self._transmat_ = best_fit['transmat']
+        self._populations_ = best_fit['populations']
+        self._fit_logprob_ = best_fit['fit_logprob']
         self._fit_time_ = time.time() - start_time
 
         if self.timing:
@@ -495,18 +498,27 @@ timescales: {timescales}
             trajectoryVec.push_back(Trajectory(<PyObject*> array, <char*> &array[0,0], array.shape[0], array.shape[1], array.strides[0], array.strides[1]))
         return trajectoryVec
 
-    def _init(self, sequences):
-        """Find initial means (hot start)"""
-        sequences = [ensure_type(s, dtype=np.float32, ndim=2, name='s', warn_on_cast=False)
-                     for s in sequences]
-
-        if self.n_hotstart == 'all':
-            small_dataset = np.vstack(sequences)
-        else:
-            small_dataset = np.vstack(sequences[0:min(len(sequences), self.n_hotstart)])
+    def _hotstart_dataset(self, sequences):
+        """Stack the sequences used to hot start the EM into one float32 array.
 
+        This is done once per call to fit, and shared by all of the runs.
+        Each sequence is cast while it is copied into its slice of a single
+        preallocated array, instead of being cast and then stacked.
+        """
+        if self.n_hotstart != 'all':
+            sequences = sequences[0:min(len(sequences), self.n_hotstart)]
+        lengths = [len(s) for s in sequences]
+        small_dataset = np.empty((sum(lengths), self.n_features), dtype=np.float32)
+        start = 0
+        for s, length in zip(sequences, lengths):
+            small_dataset[start:start + length] = s
+            start += length
+        return small_dataset
+
+    def _init(self, small_dataset, random_state):
+        """Find initial means (hot start)"""
         if self.init_algo == "GMM":
-            mix = mixture.GMM(self.n_states, n_init=1, random_state=self.random_state)
+            mix = mixture.GMM(self.n_states, n_init=1, random_state=random_state)
             mix.fit(small_dataset)
             self._means_ = mix.means_
             self._vars_ = mix.covars_
@@ -515,9 +527,12 @@ timescales: {timescales}
                 warnings.simplefilter("ignore")
                 self._means_ = cluster.MiniBatchKMeans(
                     n_clusters=self.n_states, n_init=1, init='random',
-                    random_state=self.random_state).fit(
-                    small_dataset).cluster_centers_
-            self._vars_ = np.vstack([np.var(small_dataset, axis=0)] * self.n_states)
+                    random_state=random_state).fit(
+                    small_dataset).cluster_centers_.astype(np.float64)
+            # every state starts from the same variances
+            self._vars_ = np.tile(
+                np.var(small_dataset, axis=0, dtype=np.float64),
+                (self.n_states, 1))
         self._populations_ = np.ones(self.n_states) / self.n_states
         self._transmat_ = np.empty((self.n_states, self.n_states))
         self._transmat_.fill(1.0/self.n_states)
@@ -531,8 +546,8 @@ timescales: {timescales}
         trajectoryVec = self._convert_sequences_to_vector_float(sequences)
         startprob = self.startprob
         transmat = self._transmat_
-        means = self._means_.astype(np.float64)
-        vars = self._vars_.astype(np.float64)
+        means = np.ascontiguousarray(self._means_, dtype=np.float64)
+        vars = np.ascontiguousarray(self._vars_, dtype=np.float64)
         cdef GaussianHMMFitter[float] *fitter = new GaussianHMMFitter[float](self, self.n_states, self.n_features, self.n_iter, <double*> &startprob[0])
         fitter.set_transmat(<double*> &transmat[0,0])
         fitter.set_means_and_variances(<double*> &means[0,0], <double*> &vars[0,0])
@@ -550,8 +565,8 @@ timescales: {timescales}
         trajectoryVec = self._convert_sequences_to_vector_double(sequences)
         startprob = self.startprob
         transmat = self._transmat_
-        means = self._means_.astype(np.float64)
-        vars = self._vars_.astype(np.float64)
+        means = np.ascontiguousarray(self._means_, dtype=np.float64)
+        vars = np.ascontiguousarray(self._vars_, dtype=np.float64)
         cdef GaussianHMMFitter[double] *fitter = new GaussianHMMFitter[double](self, self.n_states, self.n_features, self.n_iter, <double*> &startprob[0])
         fitter.set_transmat(<double*> &transmat[0,0])
         fitter.set_means_and_variances(<double*> &means[0,0], <double*> &vars[0,0])
@@ -561,11 +576,10 @@ timescales: {timescales}
             del fitter
 
     def _getdiff(self, means, difference_cutoff):
-        diff = np.zeros((self.n_features, self.n_states, self.n_states))
-        for i in range(self.n_features):
-            diff[i] = np.maximum(
-                np.abs(np.subtract.outer(means[:, i], means[:, i])), difference_cutoff)
-        return diff
+        # diff[i, k, j] = |means[k, i] - means[j, i]|, broadcast over all
+        # of the features at once
+        diff = np.abs(means.T[:, :, np.newaxis] - means.T[:, np.newaxis, :])
+        return np.maximum(diff, difference_cutoff, out=diff)
 
     def _do_mstep(self):
         stats = self.stats
@@ -576,11 +590,15 @@ timescales: {timescales}
                     1e-20).astype(np.float64)
             self._transmat_, self._populations_ = _transmat_mle_prinz(counts)
         elif self.reversible_type == 'transpose':
-            revcounts = np.maximum(
-                transmat_prior - 1.0 + stats['trans'] + stats['trans'].T, 1e-20)
-            populations = np.sum(revcounts, axis=0)
-            self._populations_ = populations / np.sum(populations)
-            self._transmat_ = revcounts / np.sum(revcounts, axis=1)[:, np.newaxis]
+            # symmetrize the counts and normalize them in place, directly
+            # in the transmat_ and populations_ buffers set up by _init
+            revcounts = np.add(stats['trans'], stats['trans'].T,
+                               out=self._transmat_)
+            revcounts += transmat_prior - 1.0
+            np.maximum(revcounts, 1e-20, out=revcounts)
+            populations = np.sum(revcounts, axis=0, out=self._populations_)
+            populations /= np.sum(populations)
+            revcounts /= np.sum(revcounts, axis=1)[:, np.newaxis]
         else:
             raise ValueError('Invalid value for reversible_type: %s '
                              'Must be either "mle" or "transpose"'
@@ -591,41 +609,61 @@ timescales: {timescales}
         # will be nan/inf. so padd it up by a very small constant. This particular
         # padding is following the sklearn mixture model m_step code from
         # https://github.com/scikit-learn/scikit-learn/blob/master/sklearn/mixture/gmm.py#L496
-        EPS = np.finfo(np.float32).eps
         denom = (stats['post'][:, np.newaxis] + 10 * EPS)
 
-        means = stats['obs'] / denom  # unregularized means
+        # unregularized means, written over the previous ones
+        means = np.divide(stats['obs'], denom, out=self._means_)
 
         if self.fusion_prior > 0 and self.n_lqa_iter > 0:
             # adaptive regularization strength
-            strength = self.fusion_prior / self._getdiff(means, difference_cutoff)
+            diff = self._getdiff(means, difference_cutoff)
+            strength = self.fusion_prior / diff
             rhs = stats['obs'] / self._vars_
-            for i in range(self.n_features):
-                np.fill_diagonal(strength[i], 0)
+            states = np.arange(self.n_states)
+            strength[:, states, states] = 0
+            post_over_vars = stats['post'] / self._vars_.T
 
             break_lqa = False
             for s in range(self.n_lqa_iter):
-                diff = self._getdiff(means, difference_cutoff)
+                if s > 0:
+                    # the first pass starts from the same means that the
+                    # strengths were computed from, so diff is already known
+                    diff = self._getdiff(means, difference_cutoff)
                 if np.all(diff <= difference_cutoff) or break_lqa:
                     break
 
                 offdiagonal = -strength / diff
                 diagonal_penalty = np.sum(strength / diff, axis=2)
-                for f in range(self.n_features):
-                    if np.all(diff[f] <= difference_cutoff):
-                        continue
-                    ridge_approximation = np.diag(
-                        stats['post'] / self._vars_[:, f] + diagonal_penalty[f]) + offdiagonal[f]
-                    try:
-                        means[:, f] = np.linalg.solve(ridge_approximation, rhs[:, f])
-                    except np.linalg.LinAlgError:
-                        # I'm not really sure what exactly causes the ridge
-                        # approximation to be non-solvable, but it probably
-                        # means we're too close to the merging. Maybe 1e-10
-                        # is cutting it too close. Anyways,
-                        # just break now and use the last valid value
-                        # of the means.
-                        break_lqa = True
+
+                # stack the ridge approximations for all of the features
+                # that haven't completely merged, and solve them with a
+                # single batched call instead of one call per feature
+                active = ~np.all(diff <= difference_cutoff, axis=(1, 2))
+                ridge_approximation = offdiagonal[active]
+                diagonal = (post_over_vars + diagonal_penalty)[active]
+                ridge_approximation[:, states, states] += diagonal
+                active_rhs = rhs.T[active]
+                try:
+                    solution = np.linalg.solve(
+                        ridge_approximation, active_rhs[:, :, np.newaxis])
+                except np.linalg.LinAlgError:
+                    # at least one of the systems is singular, so solve them
+                    # one feature at a time, still updating the means of
+                    # every feature whose system can be solved
+                    for f, ridge, b in zip(np.flatnonzero(active),
+                                           ridge_approximation, active_rhs):
+                        try:
+                            means[:, f] = np.linalg.solve(ridge, b)
+                        except np.linalg.LinAlgError:
+                            # I'm not really sure what exactly causes the ridge
+                            # approximation to be non-solvable, but it probably
+                            # means we're too close to the merging. Maybe 1e-10
+                            # is cutting it too close. Anyways,
+                            # just break now and use the last valid value
+                            # of the means.
+                            break_lqa = True
+                else:
+                    means[:, active] = solution[:, :, 0].T
 
             for i in range(self.n_features):
                 for k, j in zip(*np.triu_indices(self.n_states)):
@@ -640,11 +678,15 @@ timescales: {timescales}
             vars_weight = 0
             vars_prior = 0
 
-        var_num = (stats['obs**2']
-                   - 2 * self._means_ * stats['obs']
-                   + self._means_ ** 2 * denom)
-        var_denom = max(vars_weight - 1, 0) + denom
-        self._vars_ = (vars_prior + var_num) / var_denom
+        # accumulate the new variances in place, in the buffer of the
+        # previous ones
+        vars_ = np.multiply(means, stats['obs'], out=self._vars_)
+        vars_ *= -2
+        vars_ += stats['obs**2']
+        vars_ += np.square(means) * denom
+        vars_ += vars_prior
+        vars_ /= max(vars_weight - 1, 0) + denom
+        self._vars_ = vars_
 
     def score(self, sequences):
         """Log-likelihood of sequences under the model
@@ -674,8 +716,8 @@ timescales: {timescales}
         trajectoryVec = self._convert_sequences_to_vector_float(sequences)
         startprob = self.startprob
         transmat = self._transmat_
-        means = self._means_.astype(np.float64)
-        vars = self._vars_.astype(np.float64)
+        means = np.ascontiguousarray(self._means_, dtype=np.float64)
+        vars = np.ascontiguousarray(self._vars_, dtype=np.float64)
         cdef GaussianHMMFitter[float] *fitter = new GaussianHMMFitter[float](self, self.n_states, self.n_features, self.n_iter, <double*> &startprob[0])
         fitter.set_transmat(<double*> &transmat[0,0])
         fitter.set_means_and_variances(<double*> &means[0,0], <double*> &vars[0,0])
@@ -693,8 +735,8 @@ timescales: {timescales}
         trajectoryVec = self._convert_sequences_to_vector_double(sequences)
         startprob = self.startprob
         transmat = self._transmat_
-        means = self._means_.astype(np.float64)
-        vars = self._vars_.astype(np.float64)
+        means = np.ascontiguousarray(self._means_, dtype=np.float64)
+        vars = np.ascontiguousarray(self._vars_, dtype=np.float64)
         cdef GaussianHMMFitter[double] *fitter = new GaussianHMMFitter[double](self, self.n_states, self.n_features, self.n_iter, <double*> &startprob[0])
         fitter.set_transmat(<double*> &transmat[0,0])
         fitter.set_means_and_variances(<double*> &means[0,0], <double*> &vars[0,0])
@@ -743,8 +785,8 @@ timescales: {timescales}
         cdef np.ndarray[double, ndim=2] vars
         startprob = self.startprob
         transmat = self._transmat_
-        means = self._means_.astype(np.float64)
-        vars = self._vars_.astype(np.float64)
+        means = np.ascontiguousarray(self._means_, dtype=np.float64)
+        vars = np.ascontiguousarray(self._vars_, dtype=np.float64)
         cdef GaussianHMMFitter[float] *fitter = new GaussianHMMFitter[float](self, self.n_states, self.n_features, self.n_iter, <double*> &startprob[0])
         fitter.set_transmat(<double*> &transmat[0,0])
         fitter.set_means_and_variances(<double*> &means[0,0], <double*> &vars[0,0])
@@ -771,8 +813,8 @@ timescales: {timescales}
         cdef np.ndarray[double, ndim=2] vars
         startprob = self.startprob
         transmat = self._transmat_
-        means = self._means_.astype(np.float64)
-        vars = self._vars_.astype(np.float64)
+        means = np.ascontiguousarray(self._means_, dtype=np.float64)
+        vars = np.ascontiguousarray(self._vars_, dtype=np.float64)
         cdef GaussianHMMFitter[double] *fitter = new GaussianHMMFitter[double](self, self.n_states, self.n_features, self.n_iter, <double*> &startprob[0])
         fitter.set_transmat(<double*> &transmat[0,0])
         fitter.set_means_and_variances(<double*> &means[0,0], <double*> &vars[0,0])
@@ -789,6 +831,21 @@ timescales: {timescales}
         finally:
             del fitter
 
+    def _stats_buffers(self):
+        """Get the arrays that the sufficient statistics are copied into.
+
+        The arrays from the previous EM iteration are reused when they
+        have the right shape, instead of allocating new ones every M-step.
+        """
+        if ('obs' not in self.stats or
+                self.stats['obs'].shape != (self.n_states, self.n_features)):
+            self.stats['trans'] = np.empty((self.n_states, self.n_states))
+            self.stats['obs'] = np.empty((self.n_states, self.n_features))
+            self.stats['obs**2'] = np.empty((self.n_states, self.n_features))
+            self.stats['post'] = np.empty(self.n_states)
+        return (self.stats['trans'], self.stats['obs'], self.stats['obs**2'],
+                self.stats['post'])
+
     cdef _record_stats_float(self, GaussianHMMFitter[float]* fitter):
         """Copy various statistics from the C++ class to this one."""
         cdef np.ndarray[double, ndim=2] transition_counts
@@ -796,20 +853,13 @@ timescales: {timescales}
         cdef np.ndarray[double, ndim=2] obs2
         cdef np.ndarray[double, ndim=1] post
         cdef np.ndarray[double, ndim=1] log_probability
-        transition_counts = np.empty((self.n_states, self.n_states))
-        obs = np.empty((self.n_states, self.n_features))
-        obs2 = np.empty((self.n_states, self.n_features))
-        post = np.empty(self.n_states)
+        transition_counts, obs, obs2, post = self._stats_buffers()
         log_probability = np.empty(fitter.get_fit_iterations())
         fitter.get_transition_counts(<double*> &transition_counts[0,0])
         fitter.get_obs(<double*> &obs[0,0])
         fitter.get_obs2(<double*> &obs2[0,0])
         fitter.get_post(<double*> &post[0])
         fitter.get_log_probability(<double*> &log_probability[0])
-        self.stats['trans'] = transition_counts
-        self.stats['obs'] = obs
-        self.stats['obs**2'] = obs2
-        self.stats['post'] = post
         self.stats['log_probability'] = log_probability
 
     cdef _record_stats_double(self, GaussianHMMFitter[double]* fitter):
@@ -819,27 +869,20 @@ timescales: {timescales}
         cdef np.ndarray[double, ndim=2] obs2
         cdef np.ndarray[double, ndim=1] post
         cdef np.ndarray[double, ndim=1] log_probability
-        transition_counts = np.empty((self.n_states, self.n_states))
-        obs = np.empty((self.n_states, self.n_features))
-        obs2 = np.empty((self.n_states, self.n_features))
-        post = np.empty(self.n_states)
+        transition_counts, obs, obs2, post = self._stats_buffers()
         log_probability = np.empty(fitter.get_fit_iterations())
         fitter.get_transition_counts(<double*> &transition_counts[0,0])
         fitter.get_obs(<double*> &obs[0,0])
         fitter.get_obs2(<double*> &obs2[0,0])
         fitter.get_post(<double*> &post[0])
         fitter.get_log_probability(<double*> &log_probability[0])
-        self.stats['trans'] = transition_counts
-        self.stats['obs'] = obs
-        self.stats['obs**2'] = obs2
-        self.stats['post'] = post
         self.stats['log_probability'] = log_probability
 
     def __reduce__(self):
         """Pickle support"""
         args = (self.n_states, self.n_init, self.n_iter, self.n_lqa_iter, self.fusion_prior, self.thresh,
                 self.reversible_type, self.vars_prior, self.vars_weight, self.random_state,
-                self.timing, self.n_hotstart, self.init_algo)
+                self.timing, self.n_hotstart, self.init_algo, self.n_jobs)
         state = (self._means_, self._vars_, self._transmat_, self._populations_, self._fit_logprob_, self._fit_time_, self.n_features)
         return (self.__class__, args, state)
 
@@ -853,6 +896,27 @@ timescales: {timescales}
         self._fit_time_ = state[5]
         self.n_features = state[6]
 
+def _fit_one_run(GaussianHMM hmm, sequences, small_dataset, random_state):
+    """Run the EM algorithm once, from a hot start seeded by random_state.
+
+    This is a module-level function so that the n_init runs performed by
+    GaussianHMM.fit can be dispatched with joblib. It returns the fitted
+    parameters instead of relying on the state of `hmm`, which is a copy
+    when the run is performed in another process.
+    """
+    hmm.stats = {}
+    hmm._init(small_dataset, random_state)
+    if sequences[0].dtype == np.float32:
+        hmm._fit_float(sequences)
+    else:
+        hmm._fit_double(sequences)
+    return {'means': hmm._means_,
+            'vars': hmm._vars_,
+            'populations': hmm._populations_,
+            'transmat': hmm._transmat_,
+            'fit_logprob': hmm.stats['log_probability']}
+
+
 cdef public void _do_mstep_float(GaussianHMM hmm, GaussianHMMFitter[float]* fitter):
     """This function exists to let the C++ code call back into Cython."""
     cdef np.ndarray[double, ndim=2] transmat
@@ -861,8 +925,8 @@ cdef public void _do_mstep_float(GaussianHMM hmm, GaussianHMMFitter[float]* fitt
     hmm._record_stats_float(fitter)
     hmm._do_mstep()
     transmat = hmm._transmat_
-    means = hmm._means_.astype(np.float64)
-    vars = hmm._vars_.astype(np.float64)
+    means = np.ascontiguousarray(hmm._means_, dtype=np.float64)
+    vars = np.ascontiguousarray(hmm._vars_, dtype=np.float64)
     fitter.set_transmat(<double*> &transmat[0,0])
     fitter.set_means_and_variances(<double*> &means[0,0], <double*> &vars[0,0])
 
@@ -874,7 +938,7 @@ cdef public void _do_mstep_double(GaussianHMM hmm, GaussianHMMFitter[double]* fi
     hmm._record_stats_double(fitter)
     hmm._do_mstep()
     transmat = hmm._transmat_
-    means = hmm._means_.astype(np.float64)
-    vars = hmm._vars_.astype(np.float64)
+    means = np.ascontiguousarray(hmm._means_, dtype=np.float64)
+    vars = np.ascontiguousarray(hmm._vars_, dtype=np.float64)
     fitter.set_transmat(<double*> &transmat[0,0])
     fitter.set_means_and_variances(<double*> &means[0,0], <double*> &vars[0,0])
@@ -9,11 +9,12 @@ import warnings
 import scipy.special
 from sklearn import cluster, mixture
 from sklearn.utils import check_random_state
-from mdtraj.utils import ensure_type
 from .discrete_approx import discrete_approx_mvn, NotSatisfiableError
 from ..utils import check_iter_of_sequences, printoptions
 from ..msm._markovstatemodel import _transmat_mle_prinz
 
+EPS = np.finfo(np.float32).eps
+
 cdef extern from "Trajectory.h" namespace "msmbuilder":
     cdef cppclass Trajectory:
         Trajectory(PyObject*, char*, int, int, int, int) except +
@@ -172,21 +173,19 @@ cdef public class VonMisesHMM[object VonMisesHMMObject, type VonMisesHMMType]:
         """
         logi0 = lambda x: np.log(scipy.special.i0(x))
         log2pi = np.log(2 * np.pi)
+        logi0_kappas = logi0(self._kappas_)
+
+        # evaluate every (i, j, feature) term at once, with the states i
+        # along the first axis and the states j along the second
+        ki = self._kappas_[:, np.newaxis, :]
+        kj = self._kappas_[np.newaxis, :, :]
+        kij = np.sqrt(ki ** 2 + kj ** 2 + 2 * ki * kj *
+                      np.cos(self._means_[:, np.newaxis, :] - self._means_[np.newaxis, :, :]))
+        log_overlap = np.sum(logi0(kij) - (log2pi + logi0_kappas[:, np.newaxis, :] +
+                                           logi0_kappas[np.newaxis, :, :]), axis=2)
 
-        log_overlap = np.zeros((self.n_states, self.n_states))
-        for i in range(self.n_states):
-            for j in range(self.n_states):
-                for s in range(self.n_features):
-                    kij = np.sqrt(self._kappas_[i, s] ** 2 + self._kappas_[j, s] ** 2 +
-                                  2 * self._kappas_[i, s] * self._kappas_[j, s] *
-                                  np.cos(self._means_[i, s] - self._means_[j, s]))
-                    val = logi0(kij) - (log2pi + logi0(self._kappas_[i, s]) +
-                                        logi0(self._kappas_[j, s]))
-                    log_overlap[i, j] += val
-
-        for i in range(self.n_states):
-            for j in range(self.n_states):
-                log_overlap[i, j] -= 0.5 * (log_overlap[i, i] + log_overlap[j, j])
+        self_overlap = np.diag(log_overlap).copy()
+        log_overlap -= 0.5 * (self_overlap[:, np.newaxis] + self_overlap[np.newaxis, :])
 
         return log_overlap
 
@@ -296,18 +295,19 @@ timescales: {timescales}
         self._validate_sequences(sequences)
         self.n_features = sequences[0].shape[1]
         dtype = sequences[0].dtype
+        if dtype not in (np.float32, np.float64):
+            raise ValueError('Unsupported data type: '+str(dtype))
         best_fit = {'params': {}, 'loglikelihood': -np.inf}
         start_time = time.time()
         self.stats = {}
         total_iters = 0
+        sincos_dataset = self._hotstart_dataset(sequences)
         for run in range(self.n_init):
-            self._init(sequences)
+            self._init(sincos_dataset)
             if dtype == np.float32:
                 self._fit_float(sequences)
-            elif dtype == np.float64:
-                self._fit_double(sequences)
             else:
-                raise ValueError('Unsupported data type: '+str(dtype))
+                self._fit_double(sequences)
             total_iters += len(self.stats['log_probability'])
 
             # If this is better than our other runs, keep it
@@ -363,7 +363,24 @@ timescales: {timescales}
             trajectoryVec.push_back(Trajectory(<PyObject*> array, <char*> &array[0,0], array.shape[0], array.shape[1], array.strides[0], array.strides[1]))
         return trajectoryVec
 
-    def _init(self, sequences):
+    def _hotstart_dataset(self, sequences):
+        """Stack the sine and cosine of the sequences, which are clustered
+        to hot start the EM, into one float32 array.
+
+        This is done once per call to fit, and shared by all of the runs.
+        The sine and cosine are written straight into their slices of a
+        single preallocated array, instead of being stacked and then joined.
+        """
+        lengths = [len(s) for s in sequences]
+        dataset = np.empty((sum(lengths), 2 * self.n_features), dtype=np.float32)
+        start = 0
+        for s, length in zip(sequences, lengths):
+            np.sin(s, out=dataset[start:start + length, :self.n_features])
+            np.cos(s, out=dataset[start:start + length, self.n_features:])
+            start += length
+        return dataset
+
+    def _init(self, sincos_dataset):
         """Find initial means (hot start)"""
         self._transmat_ = np.ones((self.n_states, self.n_states)) * (1.0 / self.n_states)
         self._populations_ = np.ones(self.n_states) / self.n_states
@@ -372,11 +389,8 @@ timescales: {timescales}
         # get initial centers
         # the number of initial trajectories used should be configurable...
         # currently it's just the 0-th one
-        sequences = [ensure_type(s, dtype=np.float32, ndim=2, name='s', warn_on_cast=False)
-                     for s in sequences]
-        dataset = np.vstack(sequences)
-        cluster_centers = cluster.MiniBatchKMeans(n_clusters=self.n_states).fit(
-            np.hstack((np.sin(dataset), np.cos(dataset)))).cluster_centers_
+        cluster_centers = cluster.MiniBatchKMeans(n_clusters=self.n_states, n_init=1).fit(
+            sincos_dataset).cluster_centers_.astype(np.float64)
         self._means_ = np.arctan2(cluster_centers[:, :self.n_features],
                                   cluster_centers[:, self.n_features:])
         self._kappas_ = np.ones((self.n_states, self.n_features))
@@ -390,8 +404,8 @@ timescales: {timescales}
         trajectoryVec = self._convert_sequences_to_vector_float(sequences)
         startprob = self.startprob
         transmat = self._transmat_
-        means = self._means_.astype(np.float64)
-        kappas = self._kappas_.astype(np.float64)
+        means = np.ascontiguousarray(self._means_, dtype=np.float64)
+        kappas = np.ascontiguousarray(self._kappas_, dtype=np.float64)
         cdef VonMisesHMMFitter[float] *fitter = new VonMisesHMMFitter[float](self, self.n_states, self.n_features, self.n_iter, <double*> &startprob[0])
         fitter.set_transmat(<double*> &transmat[0,0])
         fitter.set_means_and_kappas(<double*> &means[0,0], <double*> &kappas[0,0])
@@ -409,8 +423,8 @@ timescales: {timescales}
         trajectoryVec = self._convert_sequences_to_vector_double(sequences)
         startprob = self.startprob
         transmat = self._transmat_
-        means = self._means_.astype(np.float64)
-        kappas = self._kappas_.astype(np.float64)
+        means = np.ascontiguousarray(self._means_, dtype=np.float64)
+        kappas = np.ascontiguousarray(self._kappas_, dtype=np.float64)
         cdef VonMisesHMMFitter[double] *fitter = new VonMisesHMMFitter[double](self, self.n_states, self.n_features, self.n_iter, <double*> &startprob[0])
         fitter.set_transmat(<double*> &transmat[0,0])
         fitter.set_means_and_kappas(<double*> &means[0,0], <double*> &kappas[0,0])
@@ -434,11 +448,15 @@ timescales: {timescales}
                 stats['trans'] + transmat_prior - 1.0, 1e-20).astype(np.float64)
             self._transmat_, self._populations_ = _transmat_mle_prinz(counts)
         elif self.reversible_type == 'transpose':
-            revcounts = np.maximum(
-                transmat_prior - 1.0 + stats['trans'] + stats['trans'].T, 1e-20)
-            populations = np.sum(revcounts, axis=0)
-            self._populations_ = populations / np.sum(populations)
-            self._transmat_ = revcounts / np.sum(revcounts, axis=1)[:, np.newaxis]
+            # symmetrize the counts and normalize them in place, directly
+            # in the transmat_ and populations_ buffers set up by _init
+            revcounts = np.add(stats['trans'], stats['trans'].T,
+                               out=self._transmat_)
+            revcounts += transmat_prior - 1.0
+            np.maximum(revcounts, 1e-20, out=revcounts)
+            populations = np.sum(revcounts, axis=0, out=self._populations_)
+            populations /= np.sum(populations)
+            revcounts /= np.sum(revcounts, axis=1)[:, np.newaxis]
         else:
             raise ValueError('Invalid value for reversible_type: %s '
                              'Must be either "mle" or "transpose"'
@@ -450,10 +468,10 @@ timescales: {timescales}
         # will be nan/inf. so padd it up by a very small constant. This particular
         # padding is following the sklearn mixture model m_step code from
         # https://github.com/scikit-learn/scikit-learn/blob/master/sklearn/mixture/gmm.py#L496
-        EPS = np.finfo(np.float32).eps
         kappa_denom = (stats['post'][:, np.newaxis] + 10 * EPS)
-        kappa_num = stats['cosobs']*np.cos(self._means_) + stats['sinobs']*np.sin(self._means_)
-        inv_kappas = kappa_num / kappa_denom
+        inv_kappas = stats['cosobs'] * np.cos(self._means_)
+        inv_kappas += stats['sinobs'] * np.sin(self._means_)
+        inv_kappas /= kappa_denom
         self._kappas_ = inverse_mbessel_ratio(inv_kappas)
 
     def score(self, sequences):
@@ -484,8 +502,8 @@ timescales: {timescales}
         trajectoryVec = self._convert_sequences_to_vector_float(sequences)
         startprob = self.startprob
         transmat = self._transmat_
-        means = self._means_.astype(np.float64)
-        kappas = self._kappas_.astype(np.float64)
+        means = np.ascontiguousarray(self._means_, dtype=np.float64)
+        kappas = np.ascontiguousarray(self._kappas_, dtype=np.float64)
         cdef VonMisesHMMFitter[float] *fitter = new VonMisesHMMFitter[float](self, self.n_states, self.n_features, self.n_iter, <double*> &startprob[0])
         fitter.set_transmat(<double*> &transmat[0,0])
         fitter.set_means_and_kappas(<double*> &means[0,0], <double*> &kappas[0,0])
@@ -503,8 +521,8 @@ timescales: {timescales}
         trajectoryVec = self._convert_sequences_to_vector_double(sequences)
         startprob = self.startprob
         transmat = self._transmat_
-        means = self._means_.astype(np.float64)
-        kappas = self._kappas_.astype(np.float64)
+        means = np.ascontiguousarray(self._means_, dtype=np.float64)
+        kappas = np.ascontiguousarray(self._kappas_, dtype=np.float64)
         cdef VonMisesHMMFitter[double] *fitter = new VonMisesHMMFitter[double](self, self.n_states, self.n_features, self.n_iter, <double*> &startprob[0])
         fitter.set_transmat(<double*> &transmat[0,0])
         fitter.set_means_and_kappas(<double*> &means[0,0], <double*> &kappas[0,0])
@@ -553,8 +571,8 @@ timescales: {timescales}
         cdef np.ndarray[double, ndim=2] kappas
         startprob = self.startprob
         transmat = self._transmat_
-        means = self._means_.astype(np.float64)
-        kappas = self._kappas_.astype(np.float64)
+        means = np.ascontiguousarray(self._means_, dtype=np.float64)
+        kappas = np.ascontiguousarray(self._kappas_, dtype=np.float64)
         cdef VonMisesHMMFitter[float] *fitter = new VonMisesHMMFitter[float](self, self.n_states, self.n_features, self.n_iter, <double*> &startprob[0])
         fitter.set_transmat(<double*> &transmat[0,0])
         fitter.set_means_and_kappas(<double*> &means[0,0], <double*> &kappas[0,0])
@@ -581,8 +599,8 @@ timescales: {timescales}
         cdef np.ndarray[double, ndim=2] kappas
         startprob = self.startprob
         transmat = self._transmat_
-        means = self._means_.astype(np.float64)
-        kappas = self._kappas_.astype(np.float64)
+        means = np.ascontiguousarray(self._means_, dtype=np.float64)
+        kappas = np.ascontiguousarray(self._kappas_, dtype=np.float64)
         cdef VonMisesHMMFitter[double] *fitter = new VonMisesHMMFitter[double](self, self.n_states, self.n_features, self.n_iter, <double*> &startprob[0])
         fitter.set_transmat(<double*> &transmat[0,0])
         fitter.set_means_and_kappas(<double*> &means[0,0], <double*> &kappas[0,0])
@@ -599,6 +617,21 @@ timescales: {timescales}
         finally:
             del fitter
 
+    def _stats_buffers(self):
+        """Get the arrays that the sufficient statistics are copied into.
+
+        The arrays from the previous EM iteration are reused when they
+        have the right shape, instead of allocating new ones every M-step.
+        """
+        if ('cosobs' not in self.stats or
+                self.stats['cosobs'].shape != (self.n_states, self.n_features)):
+            self.stats['trans'] = np.empty((self.n_states, self.n_states))
+            self.stats['cosobs'] = np.empty((self.n_states, self.n_features))
+            self.stats['sinobs'] = np.empty((self.n_states, self.n_features))
+            self.stats['post'] = np.empty(self.n_states)
+        return (self.stats['trans'], self.stats['cosobs'], self.stats['sinobs'],
+                self.stats['post'])
+
     cdef _record_stats_float(self, VonMisesHMMFitter[float]* fitter):
         """Copy various statistics from the C++ class to this one."""
         cdef np.ndarray[double, ndim=2] transition_counts
@@ -606,20 +639,13 @@ timescales: {timescales}
         cdef np.ndarray[double, ndim=2] sinobs
         cdef np.ndarray[double, ndim=1] post
         cdef np.ndarray[double, ndim=1] log_probability
-        transition_counts = np.empty((self.n_states, self.n_states))
-        cosobs = np.empty((self.n_states, self.n_features))
-        sinobs = np.empty((self.n_states, self.n_features))
-        post = np.empty(self.n_states)
+        transition_counts, cosobs, sinobs, post = self._stats_buffers()
         log_probability = np.empty(fitter.get_fit_iterations())
         fitter.get_transition_counts(<double*> &transition_counts[0,0])
         fitter.get_cosobs(<double*> &cosobs[0,0])
         fitter.get_sinobs(<double*> &sinobs[0,0])
         fitter.get_post(<double*> &post[0])
         fitter.get_log_probability(<double*> &log_probability[0])
-        self.stats['trans'] = transition_counts
-        self.stats['cosobs'] = cosobs
-        self.stats['sinobs'] = sinobs
-        self.stats['post'] = post
         self.stats['log_probability'] = log_probability
 
     cdef _record_stats_double(self, VonMisesHMMFitter[double]* fitter):
@@ -629,20 +655,13 @@ timescales: {timescales}
         cdef np.ndarray[double, ndim=2] sinobs
         cdef np.ndarray[double, ndim=1] post
         cdef np.ndarray[double, ndim=1] log_probability
-        transition_counts = np.empty((self.n_states, self.n_states))
-        cosobs = np.empty((self.n_states, self.n_features))
-        sinobs = np.empty((self.n_states, self.n_features))
-        post = np.empty(self.n_states)
+        transition_counts, cosobs, sinobs, post = self._stats_buffers()
         log_probability = np.empty(fitter.get_fit_iterations())
         fitter.get_transition_counts(<double*> &transition_counts[0,0])
         fitter.get_cosobs(<double*> &cosobs[0,0])
         fitter.get_sinobs(<double*> &sinobs[0,0])
         fitter.get_post(<double*> &post[0])
         fitter.get_log_probability(<double*> &log_probability[0])
-        self.stats['trans'] = transition_counts
-        self.stats['cosobs'] = cosobs
-        self.stats['sinobs'] = sinobs
-        self.stats['post'] = post
         self.stats['log_probability'] = log_probability
 
     def __reduce__(self):
@@ -669,8 +688,8 @@ cdef public void _do_mstep_float(VonMisesHMM hmm, VonMisesHMMFitter[float]* fitt
     hmm._record_stats_float(fitter)
     hmm._do_mstep()
     transmat = hmm._transmat_
-    means = hmm._means_.astype(np.float64)
-    kappas = hmm._kappas_.astype(np.float64)
+    means = np.ascontiguousarray(hmm._means_, dtype=np.float64)
+    kappas = np.ascontiguousarray(hmm._kappas_, dtype=np.float64)
     fitter.set_transmat(<double*> &transmat[0,0])
     fitter.set_means_and_kappas(<double*> &means[0,0], <double*> &kappas[0,0])
 
@@ -682,8 +701,8 @@ cdef public void _do_mstep_double(VonMisesHMM hmm, VonMisesHMMFitter[double]* fi
     hmm._record_stats_double(fitter)
     hmm._do_mstep()
     transmat = hmm._transmat_
-    means = hmm._means_.astype(np.float64)
-    kappas = hmm._kappas_.astype(np.float64)
+    means = np.ascontiguousarray(hmm._means_, dtype=np.float64)
+    kappas = np.ascontiguousarray(hmm._kappas_, dtype=np.float64)
     fitter.set_transmat(<double*> &transmat[0,0])
     fitter.set_means_and_kappas(<double*> &means[0,0], <double*> &kappas[0,0])
 
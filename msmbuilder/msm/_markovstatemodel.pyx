@@ -60,3 +60,49 @@ def _transmat_mle_prinz(double[:, ::1] C, double tol=1e-10):
         raise ValueError(msg)
 
     return np.array(T), np.array(pi)
+
+
+def _sample_discrete_chain(double[:, ::1] cumsum_transmat, int initial,
+                           double[::1] random):
+    """Propagate a discrete-time Markov chain from an initial state.
+
+    Parameters
+    ----------
+    cumsum_transmat : (input) 2d array of shape=(n_states, n_states)
+        The row-wise cumulative sum of the transition matrix, in C
+        (row-major) order.
+    initial : (input) int
+        The state at the first step of the chain.
+    random : (input) 1d array of shape=(n_steps,)
+        Uniform random numbers on [0, 1). ``random[i]`` selects the
+        transition into step ``i``, so ``random[0]`` is unused.
+
+    Returns
+    -------
+    chain : array of shape=(n_steps,)
+        The sampled sequence of states.
+    """
+    cdef int n_states = cumsum_transmat.shape[0]
+    cdef int n_steps = random.shape[0]
+    cdef int i, lo, hi, mid, state
+    cdef int[::1] chain = np.zeros(n_steps, dtype=np.intc)
+    if n_steps == 0:
+        return np.asarray(chain)
+
+    chain[0] = initial
+    for i in range(1, n_steps):
+        # the next state is the number of entries in the cumulative
+        # row which are below the random draw. the row is sorted, so
+        # bisect for it instead of scanning all n_states entries
+        state = chain[i - 1]
+        lo = 0
+        hi = n_states
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if cumsum_transmat[state, mid] < random[i]:
+                lo = mid + 1
+            else:
+                hi = mid
+        chain[i] = lo
+
+    return np.asarray(chain)
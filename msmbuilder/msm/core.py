@@ -14,6 +14,7 @@ from sklearn.base import TransformerMixin
 from sklearn.utils import check_random_state
 
 from . import _ratematrix
+from ._markovstatemodel import _sample_discrete_chain
 from ..utils import list_of_1d
 
 __all__ = [
@@ -249,17 +250,14 @@ class _SampleMSMMixin(object):
         r = random.rand(1 + n_steps)
 
         if state is None:
-            initial = np.sum(np.cumsum(self.populations_) < r[0])
+            initial = np.searchsorted(np.cumsum(self.populations_), r[0])
         elif hasattr(state, '__len__') and len(state) == self.n_states_:
-            initial = np.sum(np.cumsum(state) < r[0])
+            initial = np.searchsorted(np.cumsum(state), r[0])
         else:
             initial = self.mapping_[state]
 
         cstr = np.cumsum(self.transmat_, axis=1)
-
-        chain = [initial]
-        for i in range(1, n_steps):
-            chain.append(np.sum(cstr[chain[i - 1], :] < r[i]))
+        chain = _sample_discrete_chain(cstr, initial, r[:n_steps])
 
         return self.inverse_transform([chain])[0]
 
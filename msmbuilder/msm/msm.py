@@ -431,11 +431,25 @@ Timescales:
 
         # How well do they diagonalize S and C, which are
         # computed from the new test data?
-        S = np.diag(m2.populations_)
-        C = S.dot(m2.transmat_)
+        # S = diag(populations) is only ever multiplied from the left, so
+        # scale the rows by the populations instead of building S densely
+        pi = m2.populations_[:, np.newaxis]
+        C = pi * m2.transmat_
 
+        numerator = V.T.dot(C.dot(V))
+        denominator = V.T.dot(pi * V)
+
+        # trace(A B^-1) == trace(B^-1 A), so solve instead of inverting
         try:
-            trace = np.trace(V.T.dot(C.dot(V)).dot(np.linalg.inv(V.T.dot(S.dot(V)))))
+            if np.isrealobj(V):
+                # V^T S V is symmetric positive definite, so use its
+                # Cholesky factorization
+                trace = np.trace(scipy.linalg.cho_solve(
+                    scipy.linalg.cho_factor(denominator), numerator))
+            else:
+                # a non-reversible model can have complex eigenvectors, and
+                # then V^T S V is only complex symmetric, not Hermitian
+                trace = np.trace(np.linalg.solve(denominator, numerator))
         except np.linalg.LinAlgError:
             trace = np.nan
 
@@ -556,14 +570,16 @@ Timescales:
         u, lv, rv = self._get_eigensystem()
 
         sigma2 = np.zeros(n_timescales + 1)
-        for k in range(n_timescales + 1):
-            dLambda_dT = np.outer(lv[:, k], rv[:, k])
-            for i in range(self.n_states_):
-                ui = self.countsmat_[:, i]
-                wi = np.sum(ui)
-                cov = wi*np.diag(ui) - np.outer(ui, ui)
-                quad_form = dLambda_dT[i].dot(cov).dot(dLambda_dT[i])
-                sigma2[k] += quad_form / (wi**2*(wi+1))
+        for i in range(self.n_states_):
+            # the covariance only depends on the state, so build it once
+            # and apply it to the derivatives of every eigenvalue together
+            ui = self.countsmat_[:, i]
+            wi = np.sum(ui)
+            cov = wi*np.diag(ui) - np.outer(ui, ui)
+            # column k holds row i of dLambda_k/dT = outer(lv[:, k], rv[:, k])
+            dLambda_dT = lv[i, :n_timescales + 1] * rv[:, :n_timescales + 1]
+            quad_form = np.sum(dLambda_dT * cov.dot(dLambda_dT), axis=0)
+            sigma2 += quad_form / (wi**2*(wi+1))
         return np.sqrt(sigma2)
 
     def uncertainty_timescales(self):
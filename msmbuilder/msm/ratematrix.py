@@ -348,11 +348,17 @@ class ContinuousTimeMSM(BaseEstimator, _MappingTransformMixin,
         if self.mapping_ != m2.mapping_:
             V = self._map_eigenvectors(V, m2.mapping_)
 
-        S = np.diag(m2.populations_)
-        C = S.dot(m2.transmat_)
+        # S = diag(populations) is only ever multiplied from the left, so
+        # scale the rows by the populations instead of building S densely
+        pi = m2.populations_[:, np.newaxis]
+        C = pi * m2.transmat_
 
         try:
-            trace = np.trace(V.T.dot(C.dot(V)).dot(np.linalg.inv(V.T.dot(S.dot(V)))))
+            # the rate matrix is reversible, so V is real and V^T S V is
+            # positive definite. trace(A B^-1) == trace(B^-1 A), so solve
+            # with the Cholesky factorization of V^T S V instead of inverting it
+            trace = np.trace(scipy.linalg.cho_solve(
+                scipy.linalg.cho_factor(V.T.dot(pi * V)), V.T.dot(C.dot(V))))
         except np.linalg.LinAlgError:
             trace = np.nan
 
@@ -171,3 +171,20 @@ def test_pickle():
 
     logprob2, hidden2 = hmm2.predict(sequences)
     assert(logprob == logprob2)
+
+
+def test_n_jobs():
+    # running the n_init rounds of EM in parallel should give the same
+    # model as running them one after the other
+    transmat = np.array([[0.7, 0.3], [0.4, 0.6]])
+    means = np.array([[0.0], [5.0]])
+    vars = np.array([[1.0], [1.0]])
+    X = [create_timeseries(means, vars, transmat) for i in range(10)]
+
+    serial = GaussianHMM(n_states=2, n_init=4, random_state=0, n_jobs=1)
+    parallel = GaussianHMM(n_states=2, n_init=4, random_state=0, n_jobs=2)
+    serial.fit(X)
+    parallel.fit(X)
+    np.testing.assert_array_almost_equal(serial.fit_logprob_,
+                                         parallel.fit_logprob_)
+    np.testing.assert_array_almost_equal(serial.means_, parallel.means_)
@@ -17,6 +17,7 @@ from msmbuilder import cluster
 from msmbuilder.cluster import NDGrid
 from msmbuilder.example_datasets import DoubleWell
 from msmbuilder.msm import MarkovStateModel, BayesianMarkovStateModel
+from msmbuilder.msm._markovstatemodel import _sample_discrete_chain
 from msmbuilder.utils import map_drawn_samples
 
 
@@ -253,6 +254,22 @@ def test_sample():
     assert np.sum(np.abs(diff)) < 0.1
 
 
+def test_sample_discrete_chain():
+    # the compiled sampler should reproduce the pure python loop
+    random = np.random.RandomState(0)
+    transmat = random.rand(5, 5)
+    transmat /= transmat.sum(axis=1)[:, np.newaxis]
+    cstr = np.cumsum(transmat, axis=1)
+    r = random.rand(500)
+
+    ref = [2]
+    for i in range(1, len(r)):
+        ref.append(np.sum(cstr[ref[i - 1], :] < r[i]))
+
+    chain = _sample_discrete_chain(cstr, 2, r)
+    np.testing.assert_array_equal(chain, ref)
+
+
 def test_eigtransform_1():
     # test eigtransform
     model = MarkovStateModel(n_timescales=1)
@@ -379,6 +396,22 @@ def test_score_1():
         assert_approx_equal(model.score([sequence]), model.score_)
 
 
+def test_score_nonreversible():
+    # a non-reversible model can have complex eigenvectors, for which
+    # V^T S V is complex symmetric rather than Hermitian
+    sequence = [0, 0, 1, 1, 2, 2] * 10
+    model = MarkovStateModel(verbose=False, reversible_type=None,
+                             n_timescales=2)
+    model.fit([sequence])
+    V = model.right_eigenvectors_
+    assert np.iscomplexobj(V)
+
+    S = np.diag(model.populations_)
+    C = S.dot(model.transmat_)
+    ref = np.trace(V.T.dot(C.dot(V)).dot(np.linalg.inv(V.T.dot(S).dot(V))))
+    np.testing.assert_almost_equal(model.score([sequence]), ref)
+
+
 def test_ergodic_cutoff():
     assert (MarkovStateModel(lag_time=10).ergodic_cutoff ==
             BayesianMarkovStateModel(lag_time=10).ergodic_cutoff)
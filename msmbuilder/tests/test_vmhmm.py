@@ -4,6 +4,7 @@ import random
 from itertools import permutations
 
 import numpy as np
+import scipy.special
 from scipy.stats.distributions import vonmises
 import pickle
 import tempfile
@@ -121,6 +122,43 @@ def test_3_state():
         assert abs(model.fit_logprob_[-1] - model.score(X)) < 0.5
 
 
+def test_overlap():
+    transmat = np.array([[0.7, 0.3], [0.4, 0.6]])
+    means = np.array([[0.0], [2.0]])
+    kappas = np.array([[4.0], [8.0]])
+    X = [create_timeseries(means, kappas, transmat) for i in range(5)]
+    model = VonMisesHMM(n_states=2, n_init=1, n_iter=5)
+    model.fit(X)
+
+    logi0 = lambda x: np.log(scipy.special.i0(x))
+    ref = np.zeros((2, 2))
+    for i in range(2):
+        for j in range(2):
+            for s in range(1):
+                ki, kj = model.kappas_[i, s], model.kappas_[j, s]
+                kij = np.sqrt(ki ** 2 + kj ** 2 + 2 * ki * kj *
+                              np.cos(model.means_[i, s] - model.means_[j, s]))
+                ref[i, j] += logi0(kij) - (np.log(2 * np.pi) + logi0(ki) + logi0(kj))
+    ref -= 0.5 * (np.diag(ref)[:, np.newaxis] + np.diag(ref)[np.newaxis, :])
+
+    np.testing.assert_array_almost_equal(model.overlap_, ref)
+    np.testing.assert_array_almost_equal(np.diag(model.overlap_), 0)
+
+
+def test_overlap_symmetric():
+    # the normalized overlap integral is symmetric in the two states, and
+    # each state overlaps perfectly with itself
+    transmat = np.array([[0.5, 0.3, 0.2], [0.3, 0.4, 0.3], [0.2, 0.3, 0.5]])
+    means = np.array([[0.0], [2.0], [-2.0]])
+    kappas = np.array([[4.0], [8.0], [2.0]])
+    X = [create_timeseries(means, kappas, transmat) for i in range(5)]
+    model = VonMisesHMM(n_states=3, n_init=1, n_iter=5)
+    model.fit(X)
+
+    np.testing.assert_array_almost_equal(model.overlap_, model.overlap_.T)
+    np.testing.assert_array_almost_equal(np.diag(model.overlap_), 0)
+
+
 def test_pipeline():
     trajs = AlanineDipeptide().get_cached().trajectories
     p = Pipeline([
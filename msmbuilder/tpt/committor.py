@@ -203,7 +203,7 @@ def _conditional_committors(source, sink, waypoint, tprob):
     # calculate the conditional committors ( B = N*R ), B[i,j] is the prob
     # state i ends in j, where j runs over the source + sink + waypoint
     # (waypoint is position -1)
-    B = np.dot(np.linalg.inv(np.eye(n) - P), R)
+    B = np.linalg.solve(np.eye(n) - P, R)
 
     # add probs for the sinks, waypoint / b[i] is P( i --> {C & not A, B} )
     b = np.append(B[:, -1].flatten(), [0.0] * (len(Bsink_indices) - 1) + [1.0])
@@ -256,15 +256,13 @@ def _committors(sources, sinks, tprob):
     # construct the committor problem
     lhs = np.eye(n_states) - tprob
 
-    for a in sources:
-        lhs[a, :] = 0.0  # np.zeros(n)
-        lhs[:, a] = 0.0
-        lhs[a, a] = 1.0
+    lhs[sources, :] = 0.0
+    lhs[:, sources] = 0.0
+    lhs[sources, sources] = 1.0
 
-    for b in sinks:
-        lhs[b, :] = 0.0  # np.zeros(n)
-        lhs[:, b] = 0.0
-        lhs[b, b] = 1.0
+    lhs[sinks, :] = 0.0
+    lhs[:, sinks] = 0.0
+    lhs[sinks, sinks] = 1.0
 
     ident_sinks = np.zeros(n_states)
     ident_sinks[sinks] = 1.0
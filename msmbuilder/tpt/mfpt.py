@@ -20,7 +20,6 @@ note that we are using ergodic Markov Chains.
 from __future__ import print_function, division, absolute_import
 import numpy as np
 import scipy
-from mdtraj.utils.six.moves import xrange
 import copy
 from msmbuilder.msm.core import _solve_msm_eigensystem
 from msmbuilder.msm.validation.transmat_errorbar import *
@@ -168,18 +167,17 @@ def _mfpts(tprob, populations, sinks, lag_time):
     n_states = np.shape(populations)[0]
 
     if sinks is None:
-        # Use Thm 11.16 in [1]
-        limiting_matrix = np.vstack([populations] * n_states)
+        # Use Thm 11.16 in [1]. Every row of the limiting matrix is
+        # the stationary distribution, so add it by broadcasting
+        # instead of tiling it out
+        populations = np.asarray(populations)
 
         # Fundamental matrix
         fund_matrix = scipy.linalg.inv(np.eye(n_states) - tprob +
-                                       limiting_matrix)
+                                       populations)
 
         # mfpt[i,j] = (fund_matrix[j,j] - fund_matrix[i,j]) / populations[j]
-        mfpts = fund_matrix * -1
-        for j in xrange(n_states):
-            mfpts[:, j] += fund_matrix[j, j]
-            mfpts[:, j] /= populations[j]
+        mfpts = (np.diag(fund_matrix) - fund_matrix) / populations
 
         mfpts *= lag_time
 
@@ -194,17 +192,15 @@ def _mfpts(tprob, populations, sinks, lag_time):
 
         absorb_tprob = copy.copy(tprob)
 
-        for state in sinks:
-            absorb_tprob[state, :] = 0.0
-            absorb_tprob[state, state] = 2.0
-            # note it has to be 2 because we subtract
-            # the identity below.
+        absorb_tprob[sinks, :] = 0.0
+        absorb_tprob[sinks, sinks] = 2.0
+        # note it has to be 2 because we subtract
+        # the identity below.
 
         lhs = np.eye(n_states) - absorb_tprob
 
         rhs = np.ones(n_states)
-        for state in sinks:
-            rhs[state] = 0.0
+        rhs[sinks] = 0.0
 
         mfpts = lag_time * np.linalg.solve(lhs, rhs)
 
@@ -20,14 +20,10 @@ def categorical(pvals, size=None, random_state=None):
         A random number generator instance.
     """
     cumsum = np.cumsum(pvals)
-    if size is None:
-        size = (1,)
-        axis = 0
-    elif isinstance(size, tuple):
-        size = size + (1,)
-        axis = len(size) - 1
-    else:
+    if size is not None and not isinstance(size, tuple):
         raise TypeError('size must be an int or tuple of ints')
 
     random_state = check_random_state(random_state)
-    return np.sum(cumsum < random_state.random_sample(size), axis=axis)
+    # the outcome is the number of entries in the cumulative distribution
+    # which are below the uniform draw, found by bisection
+    return np.searchsorted(cumsum, random_state.random_sample(size))